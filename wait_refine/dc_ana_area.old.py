@@ -7,13 +7,14 @@
 # Copyright (C) 2022 Yeh, Hsin-Hsien <yhh76227@gmail.com>
 #
 import argparse
-import copy
 import gzip
+import io
 import math
 import os
 import re
 import sys
 import textwrap
+from contextlib import redirect_stdout
 from dataclasses import dataclass, field
 from enum import IntEnum
 from typing import Any
@@ -32,6 +33,8 @@ DEFAULT_AREA_COL_SIZE = 8
 ISYM = f"{0x251c:c}{0x2500:c}"      # fork symbol
 ESYM = f"{0x2514:c}{0x2500:c}"      # end symbol
 BSYM = f"{0x2502:c} "               # through symbol
+SUM_BAR = "=" * 32                  # summary banner
+SUM_HDR = " Top Summary ".center(32, '=')
 
 hide_op = {
     '>' : lambda a, b: a > b,
@@ -48,6 +51,25 @@ hide_cmp = {
     'pt': lambda node, op, val: hide_op[op](node.total_percent, val)
 }
 
+# unit tag: (value, info)
+unit_dict = {
+    'k': (pow(10, 3), "1 thousand"),
+    'w': (pow(10, 4), "10 thousand"),
+    'm': (pow(10, 6), "1 million"),
+    'b': (pow(10, 9), "1 billion")
+}
+
+# hide condition: <cmp> <op> <value>
+hide_re = re.compile(r"(\w{2})\s{0,10}([><=]{1,2})\s{0,10}(\w+)")
+
+# area row: <path> <total> <percent> <comb> <seq> <bbox>
+# (the area fields may be wrapped to the following lines)
+area_row_re = re.compile(r"^(\S+)\s+(\S+)\s+\S+\s+(\S+)\s+(\S+)\s+(\S+)",
+                         re.MULTILINE)
+
+# area table divider (may be indented)
+area_div_re = re.compile(r"\n[ \t]*---")
+
 
 ### Class Defintion ###
 
@@ -60,10 +82,13 @@ class UnitType(IntEnum):
 
 @dataclass(slots=True)
 class UnitAttr:
-    type:  UnitType = UnitType.NONE
-    value: float = 1
-    tag:   str   = ''
-    info:  str   = '1'
+    type:      UnitType = UnitType.NONE
+    value:     float    = 1
+    tag:       str      = ''
+    info:      str      = '1'
+    # cached log(value) and value ** n for the SCI unit
+    log_value: float    = 0.0
+    pow_list:  list     = field(default_factory=list)
 
 
 @dataclass(slots=True)
@@ -98,34 +123,38 @@ class SumGroup:
     diff_area:  int = 0
 
 
+@dataclass(slots=True, eq=False)
 class Node:
-    def __init__(self, dname: str, bname: str, level: int,
-                 total_area: float=0.0, comb_area: float=0.0,
-                 seq_area: float=0.0, bbox_area: float=0.0,
-                 parent=None, childs=None, scans=None):
-        self.dname      = dname
-        self.bname      = bname
-        self.level      = level
-        self.total_area = total_area
-        self.comb_area  = comb_area
-        self.seq_area   = seq_area
-        self.bbox_area  = bbox_area
-        self.parent     = parent
-        self.childs     = set() if childs is None else childs
-        self.scans      = set() if scans is None else sncas
-
-        self.total_percent = -1
-        self.is_show       = False
-        self.is_hide       = False
-        self.is_sub_sum    = False
-        self.sub_comb_area = None
-        self.sub_seq_area  = None
-        self.sub_bbox_area = None
-        self.gid_dict      = dict()
-        self.is_sub_root   = False
-        self.sr_name       = None
-        self.tag_name      = None
-        self.inst_name     = None
+    dname:      str
+    bname:      str
+    level:      int
+    total_area: float = 0.0
+    comb_area:  float = 0.0
+    seq_area:   float = 0.0
+    bbox_area:  float = 0.0
+    parent:     Any   = field(default=None, repr=False)
+    childs:     list  = field(default_factory=list, repr=False)
+    scans:      list  = field(default_factory=list, repr=False)
+    path:       str   = ''
+
+    total_percent: float      = field(init=False, default=-1)
+    is_show:       bool       = field(init=False, default=False)
+    is_hide:       bool       = field(init=False, default=False)
+    is_sub_sum:    bool       = field(init=False, default=False)
+    sub_comb_area: float|None = field(init=False, default=None)
+    sub_seq_area:  float|None = field(init=False, default=None)
+    sub_bbox_area: float|None = field(init=False, default=None)
+    gid_dict:      dict       = field(init=False, default_factory=dict)
+    is_sub_root:   bool       = field(init=False, default=False)
+    sr_name:       str|None   = field(init=False, default=None)
+    tag_name:      str|None   = field(init=False, default=None)
+    inst_name:     str|None   = field(init=False, default=None)
+    sub_id:        int        = field(init=False, default=0)
+
+    def __post_init__(self):
+        if not self.path:
+            self.path = (f"{self.dname}/{self.bname}" if self.dname
+                         else self.bname)
 
 
 @dataclass(slots=True)
@@ -140,6 +169,9 @@ class Design:
     diff_dict:  dict  = field(default_factory=dict)
     root_list:  list  = field(default_factory=list)
     level_list: list  = field(default_factory=list)
+    sub_comb_list: list = field(default_factory=list)
+    sub_seq_list:  list = field(default_factory=list)
+    sub_bbox_list: list = field(default_factory=list)
 
 
 class DesignDB:
@@ -162,11 +194,28 @@ class DesignDB:
 ### Sub Function ###
 
 
+def read_report(report_fp: str) -> str:
+    """Read a whole report (gzip compressed if the path ends with '.gz')"""
+    if report_fp.endswith('.gz'):
+        # inflate the whole file at once instead of the reader's chunks
+        with open(report_fp, 'rb') as f:
+            return gzip.decompress(f.read()).decode('utf-8')
+    else:
+        with open(report_fp, encoding='utf-8') as f:
+            return f.read()
+
+
+def inv_area(area: float) -> float:
+    """Return the reciprocal of an area (0.0 for a zero area)."""
+    return 1.0 / area if area else 0.0
+
+
 def load_area(area_fps, table_attr: TableAttr) -> list:
     """Load area report"""
     design_list = []
-    area_ratio = table_attr.ratio
-    area_unit = table_attr.unit.value
+    area_scale = table_attr.ratio / table_attr.unit.value
+    is_norm = table_attr.proc_mode == 'norm'
+    is_show = is_norm or table_attr.is_verbose
 
     if type(area_fps) is not list:
         area_fps = [area_fps]
@@ -176,95 +225,71 @@ def load_area(area_fps, table_attr: TableAttr) -> list:
         design_list.append(design:=Design())
         node_dict = design.node_dict
         top_node = None
-        fsm = ds_max_lv = 0
+        ds_max_lv = 0
         ds_comb_area = ds_seq_area = ds_bbox_area = 0
 
-        with open(area_fp) as f:
-            line = f.readline()
-            while line:
-                if fsm == 0:
-                    if line.strip().startswith("Hierarchical cell"):
-                        fsm = 1
-                if fsm == 1:
-                    if line.strip().startswith("---"):
-                        fsm = 2
-                elif fsm == 2 and len(toks:=line.split()):
-                    # report ending check
-                    if toks[0].startswith("---"):
-                        design.total_area = top_node.total_area
-                        design.comb_area = ds_comb_area
-                        design.seq_area = ds_seq_area
-                        design.bbox_area = ds_bbox_area
-                        design.max_lv = ds_max_lv
-                        design.top_node = top_node
-                        break
+        data = read_report(area_fp)
+
+        # skip the report header up to the divider below the title row
+        pos = data.find("Hierarchical cell")
+        pos = data.find("---", pos) if pos >= 0 else -1
+        pos = data.find("\n", pos) if pos >= 0 else -1
+        if pos < 0:
+            continue
+
+        # the report ends at the next divider
+        end = m.start() if (m:=area_div_re.search(data, pos)) else len(data)
+
+        for path, total_str, comb_str, seq_str, bbox_str in (
+                area_row_re.findall(data, pos+1, end)):
+            dname, _, bname = path.rpartition('/')  # dirname, basename
+            bname = sys.intern(bname)  # leaf names repeat across the design
+            total_area = float(total_str) * area_scale
+            comb_area = float(comb_str) * area_scale
+            seq_area = float(seq_str) * area_scale
+            bbox_area = float(bbox_str) * area_scale
+
+            ds_comb_area += comb_area
+            ds_seq_area += seq_area
+            ds_bbox_area += bbox_area
+
+            if top_node is None:
+                top_node = node = Node(dname, bname, 0, total_area,
+                                       comb_area, seq_area, bbox_area,
+                                       path=path)
+                top_node.total_percent = 1.0
+                inv_top_area = inv_area(total_area)
+            elif not dname:
+                node = Node(dname, bname, 1, total_area, comb_area,
+                            seq_area, bbox_area, parent=top_node,
+                            path=path)
+                node.total_percent = total_area * inv_top_area
+                top_node.childs.append(node)
+            else:
+                parent_node = node_dict[dname]
+                node = Node(dname, bname, path.count('/')+1,
+                            total_area, comb_area, seq_area,
+                            bbox_area, parent=parent_node, path=path)
+                node.total_percent = total_area * inv_top_area
+                parent_node.childs.append(node)
+
+            node_dict[path] = node
+
+            if node.level > ds_max_lv:
+                ds_max_lv = node.level
+            if is_norm:
+                node.scans = node.childs
+            if is_show:
+                node.is_show = True
+
+        if top_node is not None:
+            design.total_area = top_node.total_area
+            design.comb_area = ds_comb_area
+            design.seq_area = ds_seq_area
+            design.bbox_area = ds_bbox_area
+            design.max_lv = ds_max_lv
+            design.top_node = top_node
 
-                    path = toks[0]
-                    names = path.split('/')
-                    dname = '/'.join(names[:-1])  # dirname
-                    bname = names[-1]             # basename
-                    del toks[0]
-
-                    if len(toks) == 0:  # total area
-                        line = f.readline()
-                        toks = line.split()
-                    total_area = float(toks[0]) * area_ratio / area_unit
-                    del toks[0]
-
-                    if len(toks) == 0:  # total percent
-                        line = f.readline()
-                        toks = line.split()
-                    del toks[0]
-
-                    if len(toks) == 0:  # combination area
-                        line = f.readline()
-                        toks = line.split()
-                    comb_area = float(toks[0]) * area_ratio / area_unit
-                    del toks[0]
-
-                    if len(toks) == 0:  # sequence area
-                        line = f.readline()
-                        toks = line.split()
-                    seq_area = float(toks[0]) * area_ratio / area_unit
-                    del toks[0]
-
-                    if len(toks) == 0:  # bbox area
-                        line = f.readline()
-                        toks = line.split()
-                    bbox_area = float(toks[0]) * area_ratio / area_unit
-                    del toks[0]
-
-                    ds_comb_area += comb_area
-                    ds_seq_area += seq_area
-                    ds_bbox_area += bbox_area
-
-                    if top_node is None:
-                        top_node = node = Node(dname, bname, 0, total_area,
-                                               comb_area, seq_area, bbox_area)
-                        top_node.total_percent = 1.0
-                    elif len(names) == 1:
-                        node = Node(dname, bname, 1, total_area, comb_area,
-                                    seq_area, bbox_area, parent=top_node)
-                        node.total_percent = total_area / top_node.total_area
-                        top_node.childs.add(node)
-                    else:
-                        parent_node = node_dict[dname]
-                        node = Node(dname, bname, len(names), total_area,
-                                    comb_area, seq_area, bbox_area,
-                                    parent=parent_node)
-                        node.total_percent = total_area / top_node.total_area
-                        parent_node.childs.add(node)
-
-                    node_dict[path] = node
-
-                    if node.level > ds_max_lv:
-                        ds_max_lv = node.level
-                    if table_attr.proc_mode == 'norm':
-                        node.scans = node.childs
-                    if table_attr.proc_mode == 'norm' or table_attr.is_verbose:
-                        node.is_show = True
-
-                line = f.readline()
     return design_list
 
 
@@ -273,6 +298,9 @@ def load_cfg(cfg_fp, design_db: DesignDB, table_attr: TableAttr):
     dslist = design_db.design_list
     gtable = design_db.group_table
 
+    for design in dslist:
+        design.level_list = [set() for i in range(design.max_lv+1)]
+
     regexp_dplen  = re.compile(r'^default_path_length:\s{0,80}(?P<size>\d{1,3})')
     regexp_dsname = re.compile(r'^design_name:\s{0,80}(?P<pat>[^#]+)')
     regexp_grp    = re.compile(r'^grp(?P<id>\d{1,2})?:\s{0,80}(?P<pat>[^#]+)')
@@ -323,10 +351,8 @@ def load_cfg(cfg_fp, design_db: DesignDB, table_attr: TableAttr):
                             dslist[int(did)].node_dict[path].tag_name = tag
                         else:
                             for design in dslist:
-                                try:
-                                    design.node_dict[path].tag_name = tag
-                                except:
-                                    pass
+                                if (node:=design.node_dict.get(path)):
+                                    node.tag_name = tag
                         continue
                     if (m:=regexp_inst.match(line)):
                         # replace instance name
@@ -335,10 +361,8 @@ def load_cfg(cfg_fp, design_db: DesignDB, table_attr: TableAttr):
                             dslist[int(did)].node_dict[path].inst_name = inst
                         else:
                             for design in dslist:
-                                try:
-                                    design.node_dict[path].inst_name = inst
-                                except:
-                                    pass
+                                if (node:=design.node_dict.get(path)):
+                                    node.inst_name = inst
                         continue
 
                     ## Load node from configuration ##
@@ -347,6 +371,7 @@ def load_cfg(cfg_fp, design_db: DesignDB, table_attr: TableAttr):
                         # instance select by regular expression
                         pattern, *cmd_list = m.group('pat').split()
                         regexp = re.compile(pattern)
+                        cmd_ops = None  # compiled on the first match
                         if (did:=m.group('id')):
                             start_id = int(did)
                             end_id = start_id + 1
@@ -357,21 +382,19 @@ def load_cfg(cfg_fp, design_db: DesignDB, table_attr: TableAttr):
                         for did in range(start_id, end_id):
                             node_dict = dslist[did].node_dict
                             level_list = dslist[did].level_list
-                            for path in node_dict.keys():
-                                if regexp.match(path):
-                                    node = node_dict[path]
-                                    node.is_show = True
-                                    max_lv = len(level_list) - 1
-                                    if max_lv < node.level:
-                                        for i in range(node.level-max_lv):
-                                            level_list.append(set())
-                                    level_list[node.level].add(node)
-                                    parse_cmd(node, cmd_list, dslist[did],
-                                              gtable, table_attr)
+                            for path in filter(regexp.match, node_dict):
+                                node = node_dict[path]
+                                node.is_show = True
+                                level_list[node.level].add(node)
+                                if cmd_ops is None:
+                                    cmd_ops = compile_cmd(cmd_list)
+                                parse_cmd(node, cmd_ops, dslist[did],
+                                          gtable, table_attr)
                         continue
                     if (m:=regexp_node.match(line)):
                         # instance choose
                         path, *cmd_list = m.group('pat').split()
+                        cmd_ops = None  # compiled on the first match
                         if (did:=m.group('id')):
                             start_id = int(did)
                             end_id = start_id + 1
@@ -384,12 +407,10 @@ def load_cfg(cfg_fp, design_db: DesignDB, table_attr: TableAttr):
                             level_list = dslist[did].level_list
                             if (node:=node_dict.get(path)):
                                 node.is_show = True
-                                max_lv = len(level_list) - 1
-                                if max_lv < node.level:
-                                    for i in range(node.level-max_lv):
-                                        level_list.append(set())
                                 level_list[node.level].add(node)
-                                parse_cmd(node, cmd_list, dslist[did],
+                                if cmd_ops is None:
+                                    cmd_ops = compile_cmd(cmd_list)
+                                parse_cmd(node, cmd_ops, dslist[did],
                                           gtable, table_attr)
                         continue
                 except Exception as e:
@@ -398,21 +419,56 @@ def load_cfg(cfg_fp, design_db: DesignDB, table_attr: TableAttr):
 
     if gtable.max_row > 0:
         table_attr.is_sub_sum = True
+        # the group nodes are summed in show_hier_area where the hide pass
+        # unlinks scans (aliased to childs), pre-sum on the intact tree
+        for design in dslist:
+            if not design.sub_comb_list:
+                flatten_area(design)
 
     ## backward scan link ##
 
     for design in dslist:
         level_list = design.level_list
+        while len(level_list) and not level_list[-1]:
+            level_list.pop()    # keep up to the deepest loaded level
+        # each node is linked once (level sets, single parent), only the
+        # traced parents already hold all of their childs in scans
         for level in range(len(level_list)-1, 0, -1):
             for node in level_list[level]:
-                if node.parent is not None:
-                    node.parent.scans.add(node)
-                    level_list[level-1].add(node.parent)
+                if (parent:=node.parent) is not None:
+                    if parent.scans is not parent.childs:
+                        parent.scans.append(node)
+                    level_list[level-1].add(parent)
 
 
-def parse_cmd(node: Node, cmd_list: list, design: Design,
-              gtable: SimpleTable, table_attr: TableAttr):
-    """Parsing command"""
+def flatten_area(design: Design):
+    """Pre-sum sub-tree areas in one post-order pass (indexed by sub_id)"""
+    pid_list, comb_list, seq_list, bbox_list = [], [], [], []
+    scan_stack = [design.top_node]
+    while len(scan_stack):
+        node = scan_stack.pop()
+        node.sub_id = len(pid_list)
+        pid_list.append(-1 if node.parent is None else node.parent.sub_id)
+        comb_list.append(node.comb_area)
+        seq_list.append(node.seq_area)
+        bbox_list.append(node.bbox_area)
+        scan_stack.extend(node.childs)
+
+    # children always follow the parent in DFS pre-order (top node at 0)
+    for sid in range(len(pid_list)-1, 0, -1):
+        pid = pid_list[sid]
+        comb_list[pid] += comb_list[sid]
+        seq_list[pid] += seq_list[sid]
+        bbox_list[pid] += bbox_list[sid]
+
+    design.sub_comb_list = comb_list
+    design.sub_seq_list = seq_list
+    design.sub_bbox_list = bbox_list
+
+
+def compile_cmd(cmd_list: list) -> list:
+    """Compile command list to operation tuples (once per config line)"""
+    cmd_ops = []
     end_cond = len(cmd_list)
     idx = 0
 
@@ -423,13 +479,12 @@ def parse_cmd(node: Node, cmd_list: list, design: Design,
         if cmd == '':
             continue
         if cmd == 'sum':
-            sub_area_sum(node)
-            table_attr.is_sub_sum = node.is_sub_sum = True
+            cmd_ops.append(('sum',))
         elif cmd.startswith('hide'):
             toks = cmd.split(':')
             try:
                 if len(toks) == 1:
-                    node.is_hide = True
+                    cmd_ops.append(('hide', None))
                 else:
                     pat = toks[1]
                     if pat.startswith('\"'):
@@ -442,24 +497,19 @@ def parse_cmd(node: Node, cmd_list: list, design: Design,
                             idx += 1
                     pat = pat.strip('\"\'\n ')
                     try:
-                        re_pat = r"(\w{2})\s{0,10}([><=]{1,2})\s{0,10}(\w+)"
-                        ma = re.fullmatch(re_pat, pat)
-                        if ma is None or len(ma_grp:=ma.groups()) != 3:
+                        if (ma:=hide_re.fullmatch(pat)) is None:
                             raise SyntaxError
-                        else:
-                            node.is_hide = hide_cmp[ma_grp[0]](
-                                            node, ma_grp[1], float(ma_grp[2]))
+                        ma_grp = ma.groups()
+                        cmd_ops.append(('hide', (hide_cmp[ma_grp[0]],
+                                                 ma_grp[1], float(ma_grp[2]))))
                     except Exception as e:
                         print("\nPARSE_CMD: error command syntax (cmd: hide)\n")
                         raise e
             except Exception as e:
                 raise e
         elif cmd.startswith('sr'):
-            node.is_sub_root = True
-            design.root_list.append(node)
             toks = cmd.split(':')
-            if len(toks) > 1:
-                node.sr_name = toks[1].strip()
+            cmd_ops.append(('sr', toks[1].strip() if len(toks) > 1 else None))
         elif cmd.startswith('add') or cmd.startswith('sub') :
             toks = cmd.split(':')
             if len(toks[0]) == 3:
@@ -467,14 +517,8 @@ def parse_cmd(node: Node, cmd_list: list, design: Design,
                                   "specify a group ID.")
 
             gid = int(toks[0][3:])
-            if toks[0][0:3] == 'add':
-                node.gid_dict[gid] = 1
-            else:
-                node.gid_dict[gid] = -1
-
-            gkey = str(gid)
-            if gkey not in gtable.index.id:
-                gtable.add_row(gkey, '', [f'Group {gid}'], init=0.0)
+            sign = 1 if toks[0][0:3] == 'add' else -1
+            name = None
             if len(toks) > 1:
                 name = toks[1]
                 if name.startswith('\"'):
@@ -485,25 +529,57 @@ def parse_cmd(node: Node, cmd_list: list, design: Design,
                     while not name.endswith('\''):
                         name += f" {cmd_list[idx]}"
                         idx += 1
-                gtable[gid][0] = name.strip('\"\'\n ')
+                name = name.strip('\"\'\n ')
+            cmd_ops.append(('group', gid, sign, name))
         elif cmd == 'inf':
-            trace_sub_node(node, 'inf', cmd_list[idx:], design, gtable,
-                           table_attr)
+            cmd_ops.append(('trace', 'inf'))
         elif cmd[0] == 'l':
-            trace_sub_node(node, cmd[1:], cmd_list[idx:], design, gtable,
-                           table_attr)
+            cmd_ops.append(('trace', cmd[1:]))
         else:
             print("\nPARSE_CMD: error command\n")
             raise SyntaxError
 
+    return cmd_ops
+
 
-def trace_sub_node(cur_node: Node, trace_lv: str, cmd_list: list,
+def parse_cmd(node: Node, cmd_ops: list, design: Design,
+              gtable: SimpleTable, table_attr: TableAttr):
+    """Apply compiled commands to the node"""
+    for idx, cmd_op in enumerate(cmd_ops):
+        cmd = cmd_op[0]
+        if cmd == 'sum':
+            sub_area_sum(node, design)
+            table_attr.is_sub_sum = node.is_sub_sum = True
+        elif cmd == 'hide':
+            if (cond:=cmd_op[1]) is None:
+                node.is_hide = True
+            else:
+                node.is_hide = cond[0](node, cond[1], cond[2])
+        elif cmd == 'sr':
+            node.is_sub_root = True
+            design.root_list.append(node)
+            if cmd_op[1] is not None:
+                node.sr_name = cmd_op[1]
+        elif cmd == 'group':
+            _, gid, sign, name = cmd_op
+            node.gid_dict[gid] = sign
+
+            gkey = str(gid)
+            if gkey not in gtable.index.id:
+                gtable.add_row(gkey, '', [f'Group {gid}'], init=0.0)
+            if name is not None:
+                gtable[gid][0] = name
+        else:
+            trace_sub_node(node, cmd_op[1], cmd_ops[idx+1:], design, gtable,
+                           table_attr)
+
+
+def trace_sub_node(cur_node: Node, trace_lv: str, cmd_ops: list,
                    design: Design, gtable: SimpleTable,
                    table_attr: TableAttr):
     """Trace sub nodes"""
     level_list = design.level_list
     scan_lv = math.inf if trace_lv == 'inf' else cur_node.level + int(trace_lv)
-    max_lv = len(level_list) - 1
     scan_stack = []
 
     if cur_node.level < scan_lv:
@@ -513,31 +589,81 @@ def trace_sub_node(cur_node: Node, trace_lv: str, cmd_list: list,
     while len(scan_stack):
         node = scan_stack.pop()
         node.is_show = True
-        parse_cmd(node, cmd_list, design, gtable, table_attr)
-        if max_lv < node.level:
-            level_list.extend([set() for i in range(node.level - max_lv)])
-            max_lv = node.level
+        parse_cmd(node, cmd_ops, design, gtable, table_attr)
         level_list[node.level].add(node)
         if node.level < scan_lv:
             node.scans = node.childs
             scan_stack.extend(node.childs)
 
 
-def sub_area_sum(cur_node: Node):
-    """Trace and Sum sub-node area."""
-    sub_comb_area = sub_seq_area = sub_bbox_area = 0
-    scan_stack = [cur_node]
+def sub_area_sum(cur_node: Node, design: Design):
+    """Sum sub-node area (looked up from the pre-summed sub-tree lists)."""
+    if not design.sub_comb_list:
+        flatten_area(design)  # built on the first summation
+    sid = cur_node.sub_id
+    cur_node.sub_comb_area = design.sub_comb_list[sid]
+    cur_node.sub_seq_area = design.sub_seq_list[sid]
+    cur_node.sub_bbox_area = design.sub_bbox_list[sid]
 
-    while len(scan_stack):
-        node = scan_stack.pop()
-        sub_comb_area += node.comb_area
-        sub_seq_area  += node.seq_area
-        sub_bbox_area += node.bbox_area
-        scan_stack.extend(node.childs)
 
-    cur_node.sub_comb_area = sub_comb_area
-    cur_node.sub_seq_area = sub_seq_area
-    cur_node.sub_bbox_area = sub_bbox_area
+def sort_scans(node_dict: dict, is_reorder: bool):
+    """Presort the scan nodes in the stack order of the area display.
+
+    The sorted scans are frozen into tuples, no link is changed afterwards.
+    """
+    if is_reorder:
+        key, is_reverse = (lambda x:x.total_area), False
+    else:
+        key, is_reverse = (lambda x:x.bname), True
+
+    for node in node_dict.values():
+        if node.scans:
+            node.scans = tuple(sorted(node.scans, key=key,
+                                      reverse=is_reverse))
+
+
+def path_col_width(atable: SimpleTable, table_attr: TableAttr) -> int:
+    """Set and return the width of the path (name) column."""
+    if table_attr.view_type == 'path' and not table_attr.is_nosplit:
+        plen = table_attr.path_col_size
+        atable.set_col_attr('name', width=plen, is_sep=True)
+    else:
+        plen = atable.get_col_width('name')
+        if plen < table_attr.path_col_size:
+            plen = table_attr.path_col_size
+            atable.set_col_attr('name', width=plen)
+    return plen
+
+
+def show_top_summary(virtual_top: Design, table_attr: TableAttr):
+    """Show the area summary of the (virtual) top."""
+    unit = table_attr.unit
+    ts = ',' if table_attr.is_show_ts else ''
+    area_spec = f"{ts}.{table_attr.dec_place}f"
+
+    area_t = virtual_top.total_area
+    area_l = virtual_top.comb_area + virtual_top.seq_area
+    area_b = virtual_top.bbox_area
+
+    area_t2, unit_cnt = unit_exp(area_t, unit)
+    area_l2, _ = unit_exp(area_l, unit)
+    area_b2, _ = unit_exp(area_b, unit)
+
+    tag = unit.tag * unit_cnt
+    area_str_t = f"{area_t2:{area_spec}}{tag}"
+    area_len = len(area_str_t) - len(tag)
+    area_str_l = f"{area_l2:>{area_len}{area_spec}}{tag}"
+    area_str_b = f"{area_b2:>{area_len}{area_spec}}{tag}"
+
+    sum_note = "\n() : Sub-tree Area Summation\n" if table_attr.is_sub_sum else ""
+    sys.stdout.write(
+        f"\n{SUM_HDR}\n"
+        f"  total: {area_str_t} ({1.0:>6.1%})\n"
+        f"  logic: {area_str_l} ({area_l / area_t:>6.1%})\n"
+        f"   bbox: {area_str_b} ({area_b / area_t:>6.1%})\n"
+        f"{SUM_BAR}\n"
+        f"{sum_note}"
+        f"\nratio: {table_attr.ratio}  unit: {unit.info}\n\n")
 
 
 def show_hier_area(design_db: DesignDB, table_attr: TableAttr):
@@ -546,33 +672,40 @@ def show_hier_area(design_db: DesignDB, table_attr: TableAttr):
     ## create group table and remove hide node ##
 
     virtual_top = design_db.virtual_top
-    vtotal = virtual_top.total_area
+    inv_vtotal = inv_area(virtual_top.total_area)
     dslist = design_db.design_list
     gtable = design_db.group_table
     is_sub_sum = table_attr.is_sub_sum
     area_fs = table_attr.area_fs
     perc_fs = "{:6.1%}"
+    perc_fs2, str_fs2 = [perc_fs] * 2, ["{}"] * 2
     path_lv = 0
 
+    group_sum = {}
     for design in dslist:
         for level in range((last_lv := len(design.level_list)-1), -1, -1):
             for node in design.level_list[level]:
                 if node.gid_dict:
                     if node.sub_bbox_area is None:
-                        sub_area_sum(node)
+                        sub_area_sum(node, design)
                     for gid, sign in node.gid_dict.items():
-                        gtable[f'{gid}','total':'bbox'] += Array(
-                            [sign * node.total_area,
-                             sign * node.sub_comb_area,
-                             sign * node.sub_seq_area,
-                             sign * node.sub_bbox_area])
+                        if (gsum:=group_sum.get(gid)) is None:
+                            group_sum[gid] = gsum = [0.0] * 4
+                        gsum[0] += sign * node.total_area
+                        gsum[1] += sign * node.sub_comb_area
+                        gsum[2] += sign * node.sub_seq_area
+                        gsum[3] += sign * node.sub_bbox_area
                 if node.is_hide or not node.is_show:
-                    if len(node.scans) == 0 and node.parent is not None:
+                    if not node.scans and node.parent is not None:
                         node.parent.scans.remove(node)
                     else:
                         node.is_show = False
         if last_lv > path_lv:
             path_lv = last_lv
+        sort_scans(design.node_dict, table_attr.is_reorder)
+
+    for gid, gsum in group_sum.items():
+        gtable[f'{gid}','total':'bbox'] += Array(gsum)
 
     if table_attr.proc_mode == 'norm':
         path_lv = virtual_top.max_lv
@@ -584,10 +717,15 @@ def show_hier_area(design_db: DesignDB, table_attr: TableAttr):
     design_db.area_table = (atable:=SimpleTable(design_db.ahead))
 
     is_multi = len(dslist) > 1
-    is_virtual_en = is_multi and table_attr.trace_root != 'sub'
-
-    if table_attr.is_show_level:
-        path_name = '({}) {}'.format('T'.rjust(lv_digi), virtual_top.top_node)
+    is_sub_trace = table_attr.trace_root == 'sub'
+    is_leaf_trace = table_attr.trace_root == 'leaf'
+    is_virtual_en = is_multi and not is_sub_trace
+    is_tree_view = table_attr.view_type == 'tree'
+    is_inst_view = table_attr.view_type == 'inst'
+    is_show_level = table_attr.is_show_level
+
+    if is_show_level:
+        path_name = f"({'T':>{lv_digi}}) {virtual_top.top_node}"
     else:
         path_name = f'{virtual_top.top_node}'
 
@@ -612,72 +750,57 @@ def show_hier_area(design_db: DesignDB, table_attr: TableAttr):
 
         last_did = -1
         for did, design in enumerate(dslist):
-            if design.top_node.is_show or len(design.top_node.scans) > 0:
+            if design.top_node.is_show or design.top_node.scans:
                 last_did = did
 
     for did, design in enumerate(dslist):
-        if table_attr.trace_root == 'sub':
+        if is_sub_trace:
             root_list = design.root_list
         else:
-            root_list = [design.top_node]
+            root_list = (design.top_node,)
 
         for rid, root_node in enumerate(root_list):
-            if not root_node.is_show and len(root_node.scans) == 0:
+            if not root_node.is_show and not root_node.scans:
                 continue
 
             scan_stack = [root_node]
-            sym_list = []
+            end_nodes = set()  # nodes without a shown sibling after them
+            sym_pref = ""
+            root_pref = f"{did}:{root_node.bname}/"
+            lv_offset = root_node.level if is_sub_trace else 0
             while len(scan_stack):
                 node = scan_stack.pop()
-                if table_attr.view_type == 'tree':
-                    try:
-                        if node is root_node:
-                            if is_virtual_en:
-                                if did == last_did:
-                                    sym = f"{ESYM}{did}:"
-                                    sym_list.append("  ")
-                                else:
-                                    sym = f"{ISYM}{did}:"
-                                    sym_list.append(BSYM)
-                            else:
-                                sym = ""
-                        elif scan_stack[-1].level < node.level:
-                            sym = "".join(sym_list+[ESYM])
-                            if len(node.scans):
-                                sym_list.append("  ")
+                if is_tree_view:
+                    if node is root_node:
+                        if is_virtual_en:
+                            if did == last_did:
+                                sym = f"{ESYM}{did}:"
+                                sym_pref += "  "
                             else:
-                                sym_lv = scan_stack[-1].level - node.level
-                                sym_list = sym_list[:sym_lv]
+                                sym = f"{ISYM}{did}:"
+                                sym_pref += BSYM
                         else:
-                            for idx in range(len(scan_stack)-1, -1, -1):
-                                next_node = scan_stack[idx]
-                                if (next_node.level == node.level
-                                        and not next_node.is_hide):
-                                    sym = "".join(sym_list+[ISYM])
-                                    break
-                                elif next_node.level < node.level:
-                                    sym = "".join(sym_list+[ESYM])
-                                    break
-                            else:
-                                sym = "".join(sym_list+[ESYM])
-
-                            if len(node.scans):
-                                sym_list.append(BSYM)
-                    except Exception:
-                        sym = "".join(sym_list+[ESYM])
-                        if len(node.scans):
-                            sym_list.append("  ")
+                            sym = ""
+                    elif not scan_stack or scan_stack[-1].level < node.level:
+                        sym = sym_pref + ESYM
+                        if node.scans:
+                            sym_pref += "  "
+                        elif scan_stack:
+                            sym_lv = scan_stack[-1].level - node.level
+                            sym_pref = sym_pref[:sym_lv*2]
+                    else:
+                        sym = sym_pref + (ESYM if node in end_nodes else ISYM)
+                        if node.scans:
+                            sym_pref += BSYM
 
-                    if (table_attr.trace_root == 'sub'
-                            and node.sr_name is not None):
+                    if is_sub_trace and node.sr_name is not None:
                         path_name = "".join((sym, node.sr_name))
                     elif node.inst_name is None:
                         path_name = "".join((sym, node.bname))
                     else:
                         path_name = "".join((sym, node.inst_name))
-                elif table_attr.view_type == 'inst':
-                    if (table_attr.trace_root == 'sub'
-                            and node.sr_name is not None):
+                elif is_inst_view:
+                    if is_sub_trace and node.sr_name is not None:
                         path_name = node.sr_name
                     elif node.tag_name is not None:
                         path_name = node.tag_name
@@ -690,28 +813,26 @@ def show_hier_area(design_db: DesignDB, table_attr: TableAttr):
                         if is_multi:
                             path_name = f"{did}:{path_name}"
                 else:
-                    if (table_attr.trace_root == 'sub'
-                            and node.sr_name is not None):
+                    if is_sub_trace and node.sr_name is not None:
                         path_name = node.sr_name
                     elif node.tag_name is not None:
                         path_name = node.tag_name
                     else:
-                        bname = (node.bname if node.inst_name is None
-                                    else node.inst_name)
-                        path_name = (bname if node.level < 2
-                                        else f"{node.dname}/{bname}")
+                        if node.inst_name is None:
+                            path_name = node.path
+                        elif node.level < 2:
+                            path_name = node.inst_name
+                        else:
+                            path_name = f"{node.dname}/{node.inst_name}"
                         if is_multi:
                             if node.level > 0:
-                                path_name = f"{root_node.bname}/{path_name}"
-                            path_name = f"{did}:{path_name}"
+                                path_name = f"{root_pref}{path_name}"
+                            else:
+                                path_name = f"{did}:{path_name}"
 
-                if table_attr.is_show_level:
-                    if table_attr.trace_root == 'sub':
-                        level = node.level - root_node.level
-                    else:
-                        level = node.level
-                    path_name = '({}) {}'.format(str(level).rjust(lv_digi),
-                                                 path_name)
+                if is_show_level:
+                    level = node.level - lv_offset
+                    path_name = f"({level:>{lv_digi}}) {path_name}"
 
                 if node.gid_dict:
                     attr = "*"
@@ -731,7 +852,7 @@ def show_hier_area(design_db: DesignDB, table_attr: TableAttr):
                     bbox_area = node.bbox_area
 
                 atable.add_row(None, '', [
-                    ','.join([node.dname, node.bname]),     # item
+                    f"{node.dname},{node.bname}",           # item
                     node.total_area,                        # total
                     comb_area,                              # comb
                     seq_area,                               # seq
@@ -742,40 +863,53 @@ def show_hier_area(design_db: DesignDB, table_attr: TableAttr):
                     node.is_sub_sum,                        # sub_sum
                     not node.is_show,                       # hide
                     did,                                    # did
-                    rid if node == root_node else None,     # rid
+                    rid if node is root_node else None,     # rid
                     node.level,                             # level
                     attr,                                   # attr
                     path_name                               # name
                 ])
 
-                if table_attr.is_reorder:
-                    scan_stack.extend(
-                        sorted(node.scans, key=lambda x:x.total_area))
-                else:
-                    scan_stack.extend(
-                        sorted(node.scans, key=lambda x:x.bname, reverse=True))
+                if is_tree_view:
+                    # scans pop in reverse order, so the leading hidden
+                    # nodes and the first shown one end the sibling list
+                    for scan_node in node.scans:
+                        end_nodes.add(scan_node)
+                        if not scan_node.is_hide:
+                            break
+
+                scan_stack.extend(node.scans)
+
+    for key in ('total', 'comb', 'seq', 'bbox', 'logic', 'ptotal', 'pbox'):
+        atable.set_col_attr(key, align=Align.TR)
+
+    # percent base of the sub-trace: the total area of the row's sub-root
+    # (kept as the inverse, the rows only multiply)
+    inv_rtotal, sub_root_cnt, inv_rtotals = 0.0, 0, []
+    if is_sub_trace:
+        for r in range(atable.max_row):
+            if atable[r,'rid'] is not None:
+                inv_rtotal = inv_area(atable[r,'total'])
+                sub_root_cnt += 1
+            inv_rtotals.append(inv_rtotal)
 
-    root_total = 0.0
     for r in range(atable.max_row-1,-1,-1):
-        atable.attr[r,'total':'pbox'].align = [Align.TR] * 7
         if atable[r,'hide']:
-            if table_attr.trace_root == 'leaf':
+            if is_leaf_trace:
                 atable.del_row(r)
             else:
                 value = " - " if atable[r,'sub_sum'] else "-"
                 atable[r,'ptotal':'pbox'] = [value] * 2
-                atable.attr[r,'ptotal':'pbox'].fs = ["{}"] * 2
+                atable.attr[r,'ptotal':'pbox'].fs = str_fs2
         else:
             atable[r,'logic'] = atable[r,'comb'] + atable[r,'seq']
-            atable.attr[r,'ptotal':'pbox'].fs = [perc_fs] * 2
+            atable.attr[r,'ptotal':'pbox'].fs = perc_fs2
 
-            if table_attr.trace_root == 'sub':
+            if is_sub_trace:
                 if atable[r,'rid'] is not None:
                     atable[r,'name'] = f"<{atable[r,'name']}>"
-                    root_total = atable[r,'total']
-                atable[r,'ptotal'] = atable[r,'total'] / root_total
+                atable[r,'ptotal'] = atable[r,'total'] * inv_rtotals[r]
             else:
-                atable[r,'ptotal'] = atable[r,'total'] / vtotal
+                atable[r,'ptotal'] = atable[r,'total'] * inv_vtotal
 
             if (hier_area:=atable[r,'logic']+atable[r,'bbox']) > 0:
                 atable[r,'pbox'] = atable[r,'bbox'] / hier_area
@@ -788,46 +922,26 @@ def show_hier_area(design_db: DesignDB, table_attr: TableAttr):
                       is_hide_chk=True)
     ## show area report ##
 
-    unit = table_attr.unit
-
-    area_t = virtual_top.total_area
-    area_l = virtual_top.comb_area + virtual_top.seq_area
-    area_b = virtual_top.bbox_area
-
-    area_t2, fs = area_norm(area_t, table_attr)
-    area_l2, *_ = area_norm(area_l, table_attr)
-    area_b2, *_ = area_norm(area_b, table_attr)
-
-    area_str_t = fs.format(area_t2)
-    area_str_l = fs.format(area_l2).rjust(str_len:=len(area_str_t))
-    area_str_b = fs.format(area_b2).rjust(str_len)
-
-    print()
-    print(f" Top Summary ".center(32, '='))
-    print("  total: {} ({:>6.1%})".format(area_str_t, 1.0))
-    print("  logic: {} ({:>6.1%})".format(area_str_l, area_l / area_t))
-    print("   bbox: {} ({:>6.1%})".format(area_str_b, area_b / area_t))
-    print("=" * 32)
-
-    if table_attr.is_sub_sum:
-        print("\n() : Sub-tree Area Summation")
-
-    print(f"\nratio: {str(table_attr.ratio)}  unit: {unit.info}\n")
+    show_top_summary(virtual_top, table_attr)
 
     ### update group table ###
 
     if gtable.max_row > 0:
+        # set before the rows so that the 'NA' cell format is kept
+        for key in ('ptotal', 'pbox'):
+            gtable.set_col_attr(key, fs=perc_fs, align=Align.TR)
+
         for r in range(gtable.max_row):
             gtable[r,'sub_sum'] = True
             gtable[r,'logic'] = gtable[r,'comb'] + gtable[r,'seq']
 
-            if table_attr.trace_root == 'sub' and sub_root_cnt > 1:
+            if is_sub_trace and sub_root_cnt > 1:
                 gtable[r,'ptotal'] = 'NA'
                 gtable.attr[r,'ptotal'].fs = '{}'
-            elif table_attr.trace_root == 'sub' and sub_root_cnt == 1:
-                gtable[r,'ptotal'] = gtable[r,'total'] / root_total
+            elif is_sub_trace and sub_root_cnt == 1:
+                gtable[r,'ptotal'] = gtable[r,'total'] * inv_rtotal
             else:
-                gtable[r,'ptotal'] = gtable[r,'total'] / vtotal
+                gtable[r,'ptotal'] = gtable[r,'total'] * inv_vtotal
 
             if (hier_area:=gtable[r,'logic']+gtable[r,'bbox']) > 0:
                 gtable[r,'pbox'] = gtable[r,'bbox'] / hier_area
@@ -839,24 +953,15 @@ def show_hier_area(design_db: DesignDB, table_attr: TableAttr):
         for key in ('comb', 'seq', 'bbox', 'logic'):
             col_area_norm(gtable, key, table_attr, is_sub_sum=is_sub_sum)
             gtable.set_col_attr(key, align=Align.TR)
-        for key in ('ptotal', 'pbox'):
-            gtable.set_col_attr(key, fs=perc_fs, align=Align.TR)
 
-        size = max([len(x) for x in gtable.index.id.keys()])
-        for key in gtable.index.id.keys():
-            gtable[key,'name'] = \
-                "{}: {}".format(key.rjust(size), gtable[key,'name'])
+        gkeys = list(gtable.index.id.keys())
+        size = max(map(len, gkeys))
+        for key in gkeys:
+            gtable[key,'name'] = f"{key:>{size}}: {gtable[key,'name']}"
 
     ### sync column width ###
 
-    if table_attr.view_type == 'path' and not table_attr.is_nosplit:
-        plen = table_attr.path_col_size
-        atable.set_col_attr('name', width=plen, is_sep=True)
-    else:
-        plen = atable.get_col_width('name')
-        if plen < table_attr.path_col_size:
-            plen = table_attr.path_col_size
-            atable.set_col_attr('name', width=plen)
+    plen = path_col_width(atable, table_attr)
 
     if gtable.max_row > 0:
         glen = gtable.get_col_width('name')
@@ -886,14 +991,15 @@ def show_hier_area(design_db: DesignDB, table_attr: TableAttr):
         hlist += ['bbox', 'pbox']
     hlist += ['attr']
 
+    row_border = Border(left=False,right=False)
     atable.set_head_attr(border=Border(left=False,right=False))
     for r in range(ed:=atable.max_row-1):
-        atable.set_row_attr(r, border=Border(left=False,right=False))
+        atable.set_row_attr(r, border=row_border)
     if gtable.max_row > 0:
         atable.set_row_attr(ed, border=Border(left=False,right=False,
                                               bottom=False))
     else:
-        atable.set_row_attr(ed, border=Border(left=False,right=False))
+        atable.set_row_attr(ed, border=row_border)
 
     atable.header['attr'].border = Border(top=False,bottom=False,
                                           left=False, right=False)
@@ -906,7 +1012,7 @@ def show_hier_area(design_db: DesignDB, table_attr: TableAttr):
     if gtable.max_row > 0:
         gtable.set_head_attr(border=Border(left=False,right=False))
         for r in range(ed:=gtable.max_row-1):
-            gtable.set_row_attr(r, border=Border(left=False,right=False))
+            gtable.set_row_attr(r, border=row_border)
         gtable.set_row_attr(ed, border=Border(left=False,right=False,
                                               bottom=False))
         gtable.print(column=hlist[:-1])
@@ -920,15 +1026,21 @@ def show_bbox_area(design_db: DesignDB, table_attr: TableAttr):
     ## backward trace from nodes with bbox
 
     virtual_top = design_db.virtual_top
-    vtotal = virtual_top.total_area
+    inv_vtotal = inv_area(virtual_top.total_area)
     dslist = design_db.design_list
     is_sub_sum = table_attr.is_sub_sum
     area_fs = table_attr.area_fs
     perc_fs = "{:6.1%}"
+    perc_fs2, str_fs2 = [perc_fs] * 2, ["{}"] * 2
     path_lv = 0
 
     is_multi = (last_did:=len(dslist)-1) > 0
+    is_tree_view = table_attr.view_type == 'tree'
+    is_inst_view = table_attr.view_type == 'inst'
+    is_show_level = table_attr.is_show_level
+    is_leaf_trace = table_attr.trace_root == 'leaf'
 
+    linked = set()  # nodes already in the scans of their parent
     for design in dslist:
         for node in design.node_dict.values():
             if node is design.top_node and not is_multi:
@@ -941,14 +1053,17 @@ def show_bbox_area(design_db: DesignDB, table_attr: TableAttr):
                 node.is_show = True
                 if node.level > path_lv:
                     path_lv = node.level
-                while True:
-                    try:
-                        node.parent.scans.add(node)
-                        if len(node.parent.scans) > 1:
-                            break
-                        node = node.parent
-                    except Exception:
+                while (parent:=node.parent) is not None:
+                    scans = parent.scans
+                    if node not in linked:
+                        linked.add(node)
+                        scans.append(node)
+                    if len(scans) > 1:
                         break
+                    node = parent
+
+    for design in dslist:
+        sort_scans(design.node_dict, table_attr.is_reorder)
 
     lv_digi = len(str(path_lv))
     table_attr.is_sub_sum = True
@@ -957,8 +1072,8 @@ def show_bbox_area(design_db: DesignDB, table_attr: TableAttr):
 
     design_db.area_table = (atable:=SimpleTable(design_db.ahead))
 
-    if table_attr.is_show_level:
-        path_name = '({}) {}'.format('T'.rjust(lv_digi), virtual_top.top_node)
+    if is_show_level:
+        path_name = f"({'T':>{lv_digi}}) {virtual_top.top_node}"
     else:
         path_name = f'{virtual_top.top_node}'
 
@@ -983,50 +1098,36 @@ def show_bbox_area(design_db: DesignDB, table_attr: TableAttr):
 
     for did, design in enumerate(dslist):
         scan_stack = [root_node:=design.top_node]
-        sym_list = []
+        end_nodes = set()  # nodes without a shown sibling after them
+        sym_pref = ""
+        root_pref = f"{did}:{root_node.bname}/"
         while len(scan_stack):
             node = scan_stack.pop()
-            if table_attr.view_type == 'tree':
-                try:
-                    if node is root_node:
-                        if is_multi:
-                            if did == last_did:
-                                sym = f"{ESYM}{did}:"
-                                sym_list.append("  ")
-                            else:
-                                sym = f"{ISYM}{did}:"
-                                sym_list.append(BSYM)
-                        else:
-                            sym = ""
-                    elif scan_stack[-1].level < node.level:
-                        sym = "".join(sym_list+[ESYM])
-                        if len(node.scans):
-                            sym_list.append("  ")
+            if is_tree_view:
+                if node is root_node:
+                    if is_multi:
+                        if did == last_did:
+                            sym = f"{ESYM}{did}:"
+                            sym_pref += "  "
                         else:
-                            sym_list = \
-                                sym_list[:scan_stack[-1].level-node.level]
+                            sym = f"{ISYM}{did}:"
+                            sym_pref += BSYM
                     else:
-                        for idx in range(len(scan_stack)-1, -1, -1):
-                            next_node = scan_stack[idx]
-                            if next_node.level == node.level \
-                                and not next_node.is_hide:
-                                sym = "".join(sym_list+[ISYM])
-                                break
-                            elif next_node.level < node.level:
-                                sym = "".join(sym_list+[ESYM])
-                                break
-                        else:
-                            sym = "".join(sym_list+[ESYM])
-
-                        if len(node.scans):
-                            sym_list.append(BSYM)
-                except Exception:
-                    sym = "".join(sym_list+[ESYM])
-                    if len(node.scans):
-                        sym_list.append("  ")
+                        sym = ""
+                elif not scan_stack or scan_stack[-1].level < node.level:
+                    sym = sym_pref + ESYM
+                    if node.scans:
+                        sym_pref += "  "
+                    elif scan_stack:
+                        sym_lv = scan_stack[-1].level - node.level
+                        sym_pref = sym_pref[:sym_lv*2]
+                else:
+                    sym = sym_pref + (ESYM if node in end_nodes else ISYM)
+                    if node.scans:
+                        sym_pref += BSYM
 
                 path_name = "".join((sym, node.bname))
-            elif table_attr.view_type == 'inst':
+            elif is_inst_view:
                 path_name = node.bname
                 if is_multi:
                     path_name = f"{did}:{path_name}"
@@ -1034,16 +1135,15 @@ def show_bbox_area(design_db: DesignDB, table_attr: TableAttr):
                 if node.tag_name is not None:
                     path_name = node.tag_name
                 else:
-                    path_name = node.bname if node.level < 2 \
-                                else f"{node.dname}/{node.bname}"
+                    path_name = node.path
                     if is_multi:
                         if node.level > 0:
-                            path_name = f"{root_node.bname}/{path_name}"
-                        path_name = f"{did}:{path_name}"
+                            path_name = f"{root_pref}{path_name}"
+                        else:
+                            path_name = f"{did}:{path_name}"
 
-            if table_attr.is_show_level:
-                path_name = '({}) {}'.format(str(node.level).rjust(lv_digi),
-                                             path_name)
+            if is_show_level:
+                path_name = f"({node.level:>{lv_digi}}) {path_name}"
 
             if node.is_sub_sum:
                 comb_area = node.sub_comb_area
@@ -1055,7 +1155,7 @@ def show_bbox_area(design_db: DesignDB, table_attr: TableAttr):
                 bbox_area = node.bbox_area
 
             atable.add_row(None, '', [
-                ','.join([node.dname, node.bname]),     # item
+                f"{node.dname},{node.bname}",           # item
                 node.total_area,                        # total
                 comb_area,                              # comb
                 seq_area,                               # seq
@@ -1072,34 +1172,32 @@ def show_bbox_area(design_db: DesignDB, table_attr: TableAttr):
                 path_name                               # name
             ])
 
-            if table_attr.is_reorder:
-                scan_stack.extend(
-                    sorted(node.scans, key=lambda x:x.total_area))
-            else:
-                scan_stack.extend(
-                    sorted(node.scans, key=lambda x:x.bname, reverse=True))
+            if is_tree_view:
+                # scans pop in reverse order, so the leading hidden
+                # nodes and the first shown one end the sibling list
+                for scan_node in node.scans:
+                    end_nodes.add(scan_node)
+                    if not scan_node.is_hide:
+                        break
+
+            scan_stack.extend(node.scans)
+
+    for key in ('total', 'comb', 'seq', 'bbox', 'logic', 'ptotal', 'pbox'):
+        atable.set_col_attr(key, align=Align.TR)
 
-    root_total = 0.0
     for r in range(atable.max_row-1,-1,-1):
-        atable.attr[r,'total':'pbox'].align = [Align.TR] * 7
         if atable[r,'hide']:
-            if table_attr.trace_root == 'leaf':
+            if is_leaf_trace:
                 atable.del_row(r)
             else:
                 value = " - " if atable[r,'sub_sum'] else "-"
                 atable[r,'ptotal':'pbox'] = [value] * 2
-                atable.attr[r,'ptotal':'pbox'].fs = ["{}"] * 2
+                atable.attr[r,'ptotal':'pbox'].fs = str_fs2
         else:
             atable[r,'logic'] = atable[r,'comb'] + atable[r,'seq']
-            atable.attr[r,'ptotal':'pbox'].fs = [perc_fs] * 2
+            atable.attr[r,'ptotal':'pbox'].fs = perc_fs2
 
-            if table_attr.trace_root == 'sub':
-                if atable[r,'rid'] is not None:
-                    atable[r,'name'] = f"<{atable[r,'name']}>"
-                    root_total = atable[r,'total']
-                atable[r,'ptotal'] = atable[r,'total'] / root_total
-            else:
-                atable[r,'ptotal'] = atable[r,'total'] / vtotal
+            atable[r,'ptotal'] = atable[r,'total'] * inv_vtotal
 
             if (hier_area:=atable[r,'logic']+atable[r,'bbox']) > 0:
                 atable[r,'pbox'] = atable[r,'bbox'] / hier_area
@@ -1113,41 +1211,9 @@ def show_bbox_area(design_db: DesignDB, table_attr: TableAttr):
 
     ## show area report ##
 
-    unit = table_attr.unit
-    area_fs = table_attr.area_fs
-
-    area_t = virtual_top.total_area
-    area_l = virtual_top.comb_area + virtual_top.seq_area
-    area_b = virtual_top.bbox_area
-
-    area_t2, fs = area_norm(area_t, table_attr)
-    area_l2, *_ = area_norm(area_l, table_attr)
-    area_b2, *_ = area_norm(area_b, table_attr)
-
-    area_str_t = fs.format(area_t2)
-    area_str_l = fs.format(area_l2).rjust(str_len:=len(area_str_t))
-    area_str_b = fs.format(area_b2).rjust(str_len)
-
-    print()
-    print(f" Top Summary ".center(32, '='))
-    print("  total: {} ({:>6.1%})".format(area_str_t, 1.0))
-    print("  logic: {} ({:>6.1%})".format(area_str_l, area_l / area_t))
-    print("   bbox: {} ({:>6.1%})".format(area_str_b, area_b / area_t))
-    print("=" * 32)
-
-    if table_attr.is_sub_sum:
-        print("\n() : Sub-tree Area Summation")
+    show_top_summary(virtual_top, table_attr)
 
-    print(f"\nratio: {str(table_attr.ratio)}  unit: {unit.info}\n")
-
-    if table_attr.view_type == 'path' and not table_attr.is_nosplit:
-        plen = table_attr.path_col_size
-        atable.set_col_attr('name', width=plen, is_sep=True)
-    else:
-        plen = atable.get_col_width('name')
-        if plen < table_attr.path_col_size:
-            plen = table_attr.path_col_size
-            atable.set_col_attr('name', width=plen)
+    plen = path_col_width(atable, table_attr)
 
     for key in ('total', 'comb', 'seq', 'bbox', 'logic'):
         plen = atable.get_col_width(key)
@@ -1162,10 +1228,11 @@ def show_bbox_area(design_db: DesignDB, table_attr: TableAttr):
         hlist += ['bbox', 'pbox']
     hlist += ['attr']
 
+    row_border = Border(left=False,right=False)
     atable.set_head_attr(border=Border(left=False,right=False))
     for r in range(ed:=atable.max_row-1):
-        atable.set_row_attr(r, border=Border(left=False,right=False))
-    atable.set_row_attr(ed, border=Border(left=False,right=False))
+        atable.set_row_attr(r, border=row_border)
+    atable.set_row_attr(ed, border=row_border)
     atable.header['attr'].border = Border(top=False,bottom=False,
                                           left=False,right=False)
     for r in (0, atable.max_row-1):
@@ -1176,6 +1243,18 @@ def show_bbox_area(design_db: DesignDB, table_attr: TableAttr):
     print()
 
 
+def iter_leaf_path(top_node: Node):
+    """Yield the path line of each displayed leaf node"""
+    scan_stack = [top_node]
+    pop, extend = scan_stack.pop, scan_stack.extend
+    while scan_stack:
+        node = pop()
+        if (scans:=node.scans):
+            extend(scans)
+        else:
+            yield f"{node.path}\n"
+
+
 def show_divider(header_lens: list):
     """Show divider"""
     for length in header_lens:
@@ -1197,35 +1276,42 @@ def show_header(header_lens: list, header_list: list):
         pass
 
 
-def area_norm(value: float, table_attr: TableAttr) -> (float, str):
-    """Return the normalize area and the f-string."""
-    unit, org_fs = table_attr.unit, table_attr.area_fs
+def unit_exp(value: float, unit: UnitAttr) -> (float, int):
+    """Return the normalize area and the unit tag count."""
     unit_cnt = 0 if unit.type == UnitType.NONE else 1
-    if unit.type == UnitType.SCI:
-        while value >= unit.value:
-            value /= unit.value
-            unit_cnt += 1
-    return value, f"{org_fs}{unit.tag*unit_cnt}"
+    if unit.type == UnitType.SCI and value >= unit.value:
+        pow_list = unit.pow_list
+        exp = int(math.log(value) / unit.log_value)
+        # correct the float rounding of log() near the unit powers
+        if value >= pow_list[exp+1]:
+            exp += 1
+        elif value < pow_list[exp]:
+            exp -= 1
+        value /= pow_list[exp]
+        unit_cnt += exp
+    return value, unit_cnt
 
 
 def col_area_norm(table: SimpleTable, col_key, table_attr: TableAttr,
                   is_sub_sum: bool=False, is_hide_chk: bool=False):
     """Normalize area for the specific column and update the f-string."""
+    unit, org_fs = table_attr.unit, table_attr.area_fs
+    fs_dict = {}  # format: {unit_cnt: (fs, sub_sum_fs, normal_fs)}
     for r in range(table.max_row):
         if is_hide_chk and table[r,'hide']:
             value = " - " if table[r,'sub_sum'] else "-"
             table[r,col_key] = value
             table.attr[r,col_key].fs = "{}"
         else:
-            table[r,col_key], fs = \
-                area_norm(table[r,col_key], table_attr)
+            table[r,col_key], unit_cnt = unit_exp(table[r,col_key], unit)
+            if (fs_set:=fs_dict.get(unit_cnt)) is None:
+                fs = f"{org_fs}{unit.tag*unit_cnt}"
+                fs_set = fs_dict[unit_cnt] = (fs, f"({fs})", f" {fs} ")
             if is_sub_sum:
-                if table[r,'sub_sum']:
-                    table.attr[r,col_key].fs = f"({fs})"
-                else:
-                    table.attr[r,col_key].fs = f" {fs} "
+                table.attr[r,col_key].fs = \
+                    fs_set[1] if table[r,'sub_sum'] else fs_set[2]
             else:
-                table.attr[r,col_key].fs = fs
+                table.attr[r,col_key].fs = fs_set[0]
 
 
 ### Main Function ###
@@ -1329,19 +1415,13 @@ def main():
         unit.type = UnitType.SCI
         unit.tag = args.sci_unit
 
-    match unit.tag.lower():
-        case 'k':
-            unit.value = pow(10, 3)
-            unit.info = "1 thousand"
-        case 'w':
-            unit.value = pow(10, 4)
-            unit.info = "10 thousand"
-        case 'm':
-            unit.value = pow(10, 6)
-            unit.info = "1 million"
-        case 'b':
-            unit.value = pow(10, 9)
-            unit.info = "1 billion"
+    if (unit_def:=unit_dict.get(unit.tag.lower())) is not None:
+        unit.value, unit.info = unit_def
+
+    if unit.type == UnitType.SCI:
+        unit.log_value = math.log(unit.value)
+        max_exp = int(math.log(sys.float_info.max) / unit.log_value)
+        unit.pow_list = [unit.value ** n for n in range(max_exp+2)]
 
     if args.proc_mode == 'adv' and args.is_sub_trace:
         trace_root = 'sub'
@@ -1393,22 +1473,22 @@ def main():
         if design.max_lv >= virtual_top.max_lv:
             virtual_top.max_lv = design.max_lv
 
-    if table_attr.proc_mode == 'norm' or table_attr.proc_mode == 'adv':
-        show_hier_area(design_db, table_attr)
-    elif table_attr.proc_mode == 'bbox':
-        show_bbox_area(design_db, table_attr)
+    show_area = {
+        'norm': show_hier_area,
+        'adv' : show_hier_area,
+        'bbox': show_bbox_area
+    }[table_attr.proc_mode]
+
+    # collect the whole report and flush it with a single write
+    try:
+        with redirect_stdout(report_buf:=io.StringIO()):
+            show_area(design_db, table_attr)
+    finally:
+        sys.stdout.write(report_buf.getvalue())
 
     if args.dump_fn is not None:
-        with open(args.dump_fn, 'w') as f:
-            scan_stack = [design.top_node]
-            while len(scan_stack):
-                node = scan_stack.pop()
-                if len(node.scans) == 0:
-                    path_name = "" if node.level < 2 else f"{node.dname}/"
-                    path_name += node.bname
-                    f.write(f"{path_name}\n")
-                else:
-                    scan_stack.extend(node.scans)
+        with open(args.dump_fn, 'wb', buffering=1<<17) as f:
+            f.writelines(map(str.encode, iter_leaf_path(design.top_node)))
 
 
 if __name__ == '__main__':
@@ -180,8 +180,8 @@ def load_area() -> list:
         state = State.IDLE
 
         with open(area_fp) as f:
-            line = f.readline()
-            while line:
+            line_iter = iter(f.read().splitlines())
+            for line in line_iter:
                 if state == State.IDLE:
                     if line.strip().startswith("Hierarchical cell"):
                         state = State.PREF
@@ -199,40 +199,20 @@ def load_area() -> list:
                         design.max_lv = ds_max_lv
                         break
 
-                    path = toks[0]
-                    names = path.split('/')
-                    dname = '/'.join(names[:-1])  # dirname
-                    bname = names[-1]             # basename
-                    del toks[0]
+                    path, *toks = toks
+                    dname, _, bname = path.rpartition('/')  # dirname, basename
+
+                    # fields: total area, total percent, combination area,
+                    #         sequence area, bbox area
+                    # (the fields may be wrapped to the following lines)
+                    while (len(toks) < 5
+                            and (line:=next(line_iter, None)) is not None):
+                        toks += line.split()
 
-                    if len(toks) == 0:  # total area
-                        line = f.readline()
-                        toks = line.split()
                     total_area = float(toks[0]) * ratio
-                    del toks[0]
-
-                    if len(toks) == 0:  # total percent
-                        line = f.readline()
-                        toks = line.split()
-                    del toks[0]
-
-                    if len(toks) == 0:  # combination area
-                        line = f.readline()
-                        toks = line.split()
-                    comb_area = float(toks[0]) * ratio
-                    del toks[0]
-
-                    if len(toks) == 0:  # sequence area
-                        line = f.readline()
-                        toks = line.split()
-                    seq_area = float(toks[0]) * ratio
-                    del toks[0]
-
-                    if len(toks) == 0:  # bbox area
-                        line = f.readline()
-                        toks = line.split()
-                    bbox_area = float(toks[0]) * ratio
-                    del toks[0]
+                    comb_area = float(toks[2]) * ratio
+                    seq_area = float(toks[3]) * ratio
+                    bbox_area = float(toks[4]) * ratio
 
                     ds_comb_area += comb_area
                     ds_seq_area += seq_area
@@ -242,15 +222,15 @@ def load_area() -> list:
                         top_node = node = Node([dname, bname], 0, total_area,
                                                comb_area, seq_area, bbox_area)
                         top_node.total_percent = 1.0
-                    elif len(names) == 1:
+                    elif not dname:
                         node = Node([dname, bname], 1, total_area, comb_area,
                                     seq_area, bbox_area, parent=NodeWrap(top_node))
                         node.total_percent = total_area / top_node.total_area
                         top_node.childs.add(NodeWrap(node))
                     else:
                         parent_node = node_dict[dname]
-                        node = Node([dname, bname], len(names), total_area,
-                                    comb_area, seq_area, bbox_area,
+                        node = Node([dname, bname], path.count('/')+1,
+                                    total_area, comb_area, seq_area, bbox_area,
                                     parent=NodeWrap(parent_node))
                         node.total_percent = total_area / top_node.total_area
                         parent_node.childs.add(NodeWrap(node))
@@ -264,7 +244,6 @@ def load_area() -> list:
                     if proc_mode == 'norm' or is_verbose:
                         node.is_show = True
 
-                line = f.readline()
     return design_list
 
 